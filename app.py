@@ -1,6 +1,10 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 import streamlit as st
 import pandas as pd
-from blackjack_simulator import Shoe, simulate_blackjack_hand
+from blackjack_simulator import Shoe
+from martingale import RESULTS_DTYPE, simulate_martingale, _run_batch
 
 st.set_page_config(page_title="Blackjack Martingale Strategy Simulator", layout="wide")
 
@@ -21,6 +25,7 @@ st.sidebar.markdown("---")
 st.sidebar.subheader("Monte Carlo Simulation")
 num_iterations = st.sidebar.number_input("Number of iterations (cycles)", value=1, min_value=1, max_value=10000, step=1, help="Run multiple simulations to see win/loss rates")
 random_seed = st.sidebar.number_input("Random seed", value=42, step=1)
+num_workers = st.sidebar.number_input("Worker processes", value=0, min_value=0, max_value=os.cpu_count() or 1, step=1, help="Processes used to run iterations in parallel (0 = auto)")
 
 st.sidebar.markdown("---")
 st.sidebar.info(f"""
@@ -41,75 +46,221 @@ st.sidebar.info(f"""
 # Initialize numpy
 import numpy as np
 
+@st.cache_data(max_entries=16, show_spinner=False)
+def run_monte_carlo(bankroll_start, base_bet, bet_multiplier, num_decks, num_players, num_hands,
+                    dealer_hits_soft_17, num_iterations, random_seed, _num_workers=0):
+    """
+    Runs every Monte Carlo iteration, cached on the simulation parameters.
+    Returns (per-iteration results as a RESULTS_DTYPE record array, bankroll trajectory matrix);
+    plain ndarrays keep the cache cheap to hash and pickle. _num_workers doesn't affect
+    the results, so it is left out of the cache key. The progress bar is created in here:
+    a cache hit replays it, which Streamlit can only do for elements made by this function.
+    """
+    progress_bar = st.progress(0.0)
+
+    def report_progress(done, total):
+        # Roughly 1% steps; each update is a message to the browser
+        if done == total or done % max(1, total // 100) == 0:
+            progress_bar.progress(done / total, text=f"{done} / {total} iterations")
+
+    tasks = [
+        (random_seed + i, bankroll_start, base_bet, bet_multiplier, num_decks,
+         num_players, num_hands, dealer_hits_soft_17)
+        for i in range(num_iterations)
+    ]
+    workers = _num_workers or os.cpu_count() or 1
+
+    runs = [None] * num_iterations
+    # Pool startup isn't worth it for a handful of iterations
+    if num_iterations < 8 or workers == 1:
+        # ~10% batches: progress updates, while wide enough for the vectorised (no-numba) path
+        batch = max(1, num_iterations // 10)
+        done = 0
+        for start in range(0, num_iterations, batch):
+            batch_runs = _run_batch(tasks[start:start + batch])
+            runs[start:start + len(batch_runs)] = batch_runs
+            done += len(batch_runs)
+            report_progress(done, num_iterations)
+    else:
+        # Submit in batches so the number of pending futures stays ~4 per worker
+        batch = max(1, num_iterations // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            futures = {
+                ex.submit(_run_batch, tasks[start:start + batch]): start
+                for start in range(0, num_iterations, batch)
+            }
+            done = 0
+            for fut in as_completed(futures):
+                start = futures[fut]
+                batch_runs = fut.result()
+                runs[start:start + len(batch_runs)] = batch_runs
+                done += len(batch_runs)
+                report_progress(done, num_iterations)
+
+    results_arr = np.empty(num_iterations, RESULTS_DTYPE)
+    # Bankroll per hand (rows) for each iteration (columns); NaN after an iteration ends
+    traj_mat = np.full((num_hands, num_iterations), np.nan, dtype=np.float64)
+    for i, (record, bankrolls) in enumerate(runs):
+        results_arr[i] = (i + 1, *record)
+        traj_mat[:len(bankrolls), i] = bankrolls
+    progress_bar.empty()
+    return results_arr, traj_mat
+
+
+@st.fragment
+def render_results(results_arr, traj_mat):
+    """
+    Renders the Monte Carlo results. As a fragment, interacting with the widgets in here
+    reruns only this function instead of the whole script.
+    """
+    num_iterations = len(results_arr)
+    results_df = pd.DataFrame(results_arr)
+
+    # Calculate statistics (straight off the ndarrays, one reduction each)
+    profits = results_arr["profit"]
+    bust_count = int(results_arr["bust"].sum())
+    win_count = int(results_arr["won"].sum())
+    bust_rate = bust_count / num_iterations * 100
+    win_rate = win_count / num_iterations * 100
+    avg_final_bankroll = results_arr["final_bankroll"].mean()
+
+    # Calculate profit statistics for outlier analysis
+    profit_mean = avg_profit = profits.mean()
+    profit_std = profits.std(ddof=1)
+    profit_min, profit_median, profit_max = np.quantile(profits, [0.0, 0.5, 1.0])
+
+    st.subheader("Monte Carlo Simulation Results")
+    st.write(f"**{num_iterations} iterations completed**")
+
+    # Key metrics
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Win Rate", f"{win_rate:.1f}%", help="Simulations that ended without bust")
+    col2.metric("Bust Rate", f"{bust_rate:.1f}%", help="Simulations that busted")
+    col3.metric("Avg Final Bankroll", f"${avg_final_bankroll:,.2f}")
+    col4.metric("Avg Profit", f"${avg_profit:,.2f}")
+
+    # Show profit distribution with std dev markers
+    st.markdown("### Profit Distribution")
+
+    # Display key statistics with visual indicators
+    col_a, col_b, col_c = st.columns(3)
+    with col_a:
+        st.metric("Mean Profit", f"${profit_mean:,.2f}")
+        st.caption("📊 Average across all simulations")
+    with col_b:
+        st.metric("Median Profit", f"${profit_median:,.2f}")
+        st.caption("📍 Middle value (50th percentile)")
+    with col_c:
+        st.metric("Std Deviation", f"${profit_std:,.2f}")
+        st.caption("📏 Measure of spread")
+
+    # Show standard deviation ranges
+    st.markdown("**Standard Deviation Ranges:**")
+    st.write(f"• **1σ Range**: ${profit_mean - profit_std:,.2f} to ${profit_mean + profit_std:,.2f} (contains ~68% of results)")
+    st.write(f"• **2σ Range**: ${profit_mean - 2*profit_std:,.2f} to ${profit_mean + 2*profit_std:,.2f} (contains ~95% of results)")
 
-def simulate_martingale(bankroll_start, base_bet, bet_multiplier, shoe, num_players, num_hands, dealer_hits_soft_17):
-    bankroll = bankroll_start
-    loss_streak = 0
-    records = []
-
-    for hand_num in range(1, num_hands + 1):
-        current_bet = base_bet * (bet_multiplier ** loss_streak)
-
-        # If next required bet exceeds bankroll, bust
-        if current_bet > bankroll:
-            records.append({
-                "hand": hand_num,
-                "result": "BUST",
-                "player_hand": "",
-                "dealer_hand": "",
-                "player_value": "",
-                "dealer_value": "",
-                "bet": current_bet,
-                "bankroll": bankroll,
-                "profit": bankroll - bankroll_start,
-                "streak_losses": loss_streak,
-            })
-            break
-
-        result, payout, hands = simulate_blackjack_hand(
-            shoe, num_players=num_players, bet=current_bet, dealer_hits_soft_17=dealer_hits_soft_17
-        )
-
-        if result == "win":
-            bankroll += payout
-            loss_streak = 0
-        elif result == "push":
-            pass
-        else:  # lose
-            bankroll -= current_bet
-            loss_streak += 1
-
-        records.append({
-            "hand": hand_num,
-            "result": result,
-            "player_hand": hands["player"],
-            "dealer_hand": hands["dealer"],
-            "player_value": hands["player_value"],
-            "dealer_value": hands["dealer_value"],
-            "bet": current_bet,
-            "bankroll": bankroll,
-            "profit": bankroll - bankroll_start,
-            "streak_losses": loss_streak,
-        })
-
-        if bankroll <= 0:
-            break
-
-    return pd.DataFrame(records)
+    # Create histogram using Streamlit's bar chart
+    st.markdown("**Profit Histogram:**")
+    num_bins = min(50, max(10, num_iterations // 2))
+    counts, edges = np.histogram(profits, bins=num_bins)
+    hist_df = pd.DataFrame(
+        {'Frequency': counts},
+        index=pd.Index([f"${edge:,.0f}" for edge in edges[:-1]], name='Profit Range')
+    )
+    st.bar_chart(hist_df)
+
+    # Show final bankroll distribution (binned, not one bar per distinct value)
+    st.markdown("### Final Bankroll Distribution")
+    counts, edges = np.histogram(results_arr["final_bankroll"], bins=num_bins)
+    st.bar_chart(pd.DataFrame(
+        {'Frequency': counts},
+        index=pd.Index([f"${edge:,.0f}" for edge in edges[:-1]], name='Final Bankroll')
+    ))
+
+    # Show sample trajectories (10 by default); changing the count reruns only this fragment
+    st.markdown("### Sample Bankroll Trajectories")
+    sample_size = st.slider("Trajectories to plot", 1, min(50, num_iterations), min(10, num_iterations))
+    sample_hands = results_arr["hands_played"][:sample_size].max()
+    pivot_df = pd.DataFrame(
+        traj_mat[:sample_hands, :sample_size],
+        index=pd.RangeIndex(1, sample_hands + 1, name="hand"),
+        columns=pd.RangeIndex(1, sample_size + 1, name="iteration"),
+    )
+    st.line_chart(pivot_df, use_container_width=True)
+
+    # Detailed results table
+    st.markdown("### Detailed Results by Iteration")
+    st.dataframe(results_df[[
+        "iteration", "bust", "won", "final_bankroll", "profit", 
+        "hands_played", "max_loss_streak"
+    ]])
+
+    # Summary statistics
+    st.markdown("### Statistical Summary")
+
+    # Filter outliers (beyond 1 and 2 standard deviations)
+    within_1_std = profits[(profits >= profit_mean - profit_std) & (profits <= profit_mean + profit_std)]
+    within_2_std = profits[(profits >= profit_mean - 2*profit_std) & (profits <= profit_mean + 2*profit_std)]
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.write("**Overall Profit Statistics:**")
+        st.write(f"- Mean Profit: ${profit_mean:,.2f}")
+        st.write(f"- Median Profit: ${profit_median:,.2f}")
+        st.write(f"- Std Dev: ${profit_std:,.2f}")
+        st.write(f"- Min Profit: ${profit_min:,.2f}")
+        st.write(f"- Max Profit: ${profit_max:,.2f}")
+
+    with col2:
+        st.write("**Profit Without Outliers:**")
+        pct_within_1_std = len(within_1_std) / num_iterations * 100
+        pct_within_2_std = len(within_2_std) / num_iterations * 100
+
+        st.write(f"*Within 1σ ({pct_within_1_std:.1f}% of data):*")
+        if len(within_1_std) > 0:
+            st.write(f"- Avg: ${within_1_std.mean():,.2f}")
+            st.write(f"- Range: ${within_1_std.min():,.2f} to ${within_1_std.max():,.2f}")
+        else:
+            st.write("- No data")
+
+        st.write(f"*Within 2σ ({pct_within_2_std:.1f}% of data):*")
+        if len(within_2_std) > 0:
+            st.write(f"- Avg: ${within_2_std.mean():,.2f}")
+            st.write(f"- Range: ${within_2_std.min():,.2f} to ${within_2_std.max():,.2f}")
+        else:
+            st.write("- No data")
+
+    with col3:
+        st.write("**Game Statistics:**")
+        st.write(f"- Avg Hands Played: {results_arr['hands_played'].mean():.1f}")
+        st.write(f"- Avg Max Loss Streak: {results_arr['max_loss_streak'].mean():.1f}")
+        st.write(f"- Max Loss Streak (all): {results_arr['max_loss_streak'].max()}")
+        st.write(f"- Busts: {bust_count} / {num_iterations}")
+        st.write(f"- Outliers (>2σ): {num_iterations - len(within_2_std)}")
+
+    # Add visual representation of data distribution
+    st.markdown("### Profit Distribution Analysis")
+    st.write(f"""
+    **Understanding the data:**
+    - **Mean**: ${profit_mean:,.2f} - Average across all simulations
+    - **Median**: ${profit_median:,.2f} - Middle value (50th percentile)
+    - **1σ range**: ${profit_mean - profit_std:,.2f} to ${profit_mean + profit_std:,.2f} (contains ~68% of typical results)
+    - **2σ range**: ${profit_mean - 2*profit_std:,.2f} to ${profit_mean + 2*profit_std:,.2f} (contains ~95% of typical results)
+
+    💡 **Typical profit** (excluding extreme outliers beyond 2σ): **${within_2_std.mean():,.2f}** based on {len(within_2_std)} simulations
+    """)
 
 
 if st.button("Run Simulation"):
     if num_iterations == 1:
         # Single simulation with detailed output
         with st.spinner("Simulating blackjack hands..."):
-            np.random.seed(random_seed)
-            shoe = Shoe(num_decks=num_decks)
-            df = simulate_martingale(
+            shoe = Shoe(num_decks=num_decks, seed=random_seed)
+            (bust, final_bankroll, hands_played, max_loss_streak), df = simulate_martingale(
                 bankroll_start, base_bet, bet_multiplier, shoe, num_players, num_hands, dealer_hits_soft_17
             )
 
-        bust = df["result"].eq("BUST").any()
-        final_bankroll = df.iloc[-1]["bankroll"]
         total_profit = final_bankroll - bankroll_start
 
         st.subheader("Simulation Results")
@@ -127,183 +278,17 @@ if st.button("Run Simulation"):
         ]])
 
         st.markdown("### Summary Stats")
-        st.write(f"Hands Played: {len(df)}")
-        st.write(f"Max Loss Streak: {df['streak_losses'].max()}")
+        st.write(f"Hands Played: {hands_played}")
+        st.write(f"Max Loss Streak: {max_loss_streak}")
     
     else:
         # Multiple iterations - Monte Carlo simulation
         with st.spinner(f"Running {num_iterations} simulations..."):
-            iteration_results = []
-            all_trajectories = []
-            
-            for i in range(num_iterations):
-                # Set seed for reproducibility, but different for each iteration
-                np.random.seed(random_seed + i)
-                shoe = Shoe(num_decks=num_decks)
-                
-                df = simulate_martingale(
-                    bankroll_start, base_bet, bet_multiplier, shoe, num_players, num_hands, dealer_hits_soft_17
-                )
-                
-                bust = df["result"].eq("BUST").any()
-                final_bankroll = df.iloc[-1]["bankroll"]
-                total_profit = final_bankroll - bankroll_start
-                hands_played = len(df)
-                max_loss_streak = df['streak_losses'].max()
-                
-                iteration_results.append({
-                    "iteration": i + 1,
-                    "bust": bust,
-                    "final_bankroll": final_bankroll,
-                    "profit": total_profit,
-                    "hands_played": hands_played,
-                    "max_loss_streak": max_loss_streak,
-                    "won": not bust and total_profit >= 0
-                })
-                
-                # Store trajectory for visualization
-                trajectory = df[["hand", "bankroll"]].copy()
-                trajectory["iteration"] = i + 1
-                all_trajectories.append(trajectory)
-            
-            results_df = pd.DataFrame(iteration_results)
-            trajectories_df = pd.concat(all_trajectories, ignore_index=True)
-            
-            # Calculate statistics
-            bust_count = results_df["bust"].sum()
-            win_count = results_df["won"].sum()
-            bust_rate = bust_count / num_iterations * 100
-            win_rate = win_count / num_iterations * 100
-            avg_profit = results_df["profit"].mean()
-            avg_final_bankroll = results_df["final_bankroll"].mean()
-            
-            # Calculate profit statistics for outlier analysis
-            profit_mean = results_df['profit'].mean()
-            profit_std = results_df['profit'].std()
-            profit_median = results_df['profit'].median()
-            
-            st.subheader("Monte Carlo Simulation Results")
-            st.write(f"**{num_iterations} iterations completed**")
-            
-            # Key metrics
-            col1, col2, col3, col4 = st.columns(4)
-            col1.metric("Win Rate", f"{win_rate:.1f}%", help="Simulations that ended without bust")
-            col2.metric("Bust Rate", f"{bust_rate:.1f}%", help="Simulations that busted")
-            col3.metric("Avg Final Bankroll", f"${avg_final_bankroll:,.2f}")
-            col4.metric("Avg Profit", f"${avg_profit:,.2f}")
-            
-            # Show profit distribution with std dev markers
-            st.markdown("### Profit Distribution")
-            
-            # Display key statistics with visual indicators
-            col_a, col_b, col_c = st.columns(3)
-            with col_a:
-                st.metric("Mean Profit", f"${profit_mean:,.2f}")
-                st.caption("📊 Average across all simulations")
-            with col_b:
-                st.metric("Median Profit", f"${profit_median:,.2f}")
-                st.caption("📍 Middle value (50th percentile)")
-            with col_c:
-                st.metric("Std Deviation", f"${profit_std:,.2f}")
-                st.caption("📏 Measure of spread")
-            
-            # Show standard deviation ranges
-            st.markdown("**Standard Deviation Ranges:**")
-            st.write(f"• **1σ Range**: ${profit_mean - profit_std:,.2f} to ${profit_mean + profit_std:,.2f} (contains ~68% of results)")
-            st.write(f"• **2σ Range**: ${profit_mean - 2*profit_std:,.2f} to ${profit_mean + 2*profit_std:,.2f} (contains ~95% of results)")
-            
-            # Create histogram using Streamlit's bar chart
-            st.markdown("**Profit Histogram:**")
-            hist_data = pd.cut(results_df['profit'], bins=min(50, max(10, num_iterations // 2)))
-            hist_counts = hist_data.value_counts().sort_index()
-            hist_df = pd.DataFrame({
-                'Profit Range': [f"${interval.left:,.0f}" for interval in hist_counts.index],
-                'Frequency': hist_counts.values
-            })
-            hist_df = hist_df.set_index('Profit Range')
-            st.bar_chart(hist_df)
-            
-            # Show final bankroll distribution
-            st.markdown("### Final Bankroll Distribution")
-            st.bar_chart(results_df["final_bankroll"].value_counts().sort_index())
-            
-            # Show sample trajectories (max 10)
-            st.markdown("### Sample Bankroll Trajectories")
-            sample_size = min(10, num_iterations)
-            sample_trajectories = trajectories_df[trajectories_df["iteration"] <= sample_size]
-            
-            # Pivot for line chart
-            pivot_df = sample_trajectories.pivot(index="hand", columns="iteration", values="bankroll")
-            st.line_chart(pivot_df, use_container_width=True)
-            
-            # Detailed results table
-            st.markdown("### Detailed Results by Iteration")
-            st.dataframe(results_df[[
-                "iteration", "bust", "won", "final_bankroll", "profit", 
-                "hands_played", "max_loss_streak"
-            ]])
-            
-            # Summary statistics
-            st.markdown("### Statistical Summary")
-            
-            # Filter outliers (beyond 1 and 2 standard deviations)
-            within_1_std = results_df[
-                (results_df['profit'] >= profit_mean - profit_std) & 
-                (results_df['profit'] <= profit_mean + profit_std)
-            ]
-            within_2_std = results_df[
-                (results_df['profit'] >= profit_mean - 2*profit_std) & 
-                (results_df['profit'] <= profit_mean + 2*profit_std)
-            ]
-            
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                st.write("**Overall Profit Statistics:**")
-                st.write(f"- Mean Profit: ${profit_mean:,.2f}")
-                st.write(f"- Median Profit: ${profit_median:,.2f}")
-                st.write(f"- Std Dev: ${profit_std:,.2f}")
-                st.write(f"- Min Profit: ${results_df['profit'].min():,.2f}")
-                st.write(f"- Max Profit: ${results_df['profit'].max():,.2f}")
-            
-            with col2:
-                st.write("**Profit Without Outliers:**")
-                pct_within_1_std = len(within_1_std) / num_iterations * 100
-                pct_within_2_std = len(within_2_std) / num_iterations * 100
-                
-                st.write(f"*Within 1σ ({pct_within_1_std:.1f}% of data):*")
-                if len(within_1_std) > 0:
-                    st.write(f"- Avg: ${within_1_std['profit'].mean():,.2f}")
-                    st.write(f"- Range: ${within_1_std['profit'].min():,.2f} to ${within_1_std['profit'].max():,.2f}")
-                else:
-                    st.write("- No data")
-                
-                st.write(f"*Within 2σ ({pct_within_2_std:.1f}% of data):*")
-                if len(within_2_std) > 0:
-                    st.write(f"- Avg: ${within_2_std['profit'].mean():,.2f}")
-                    st.write(f"- Range: ${within_2_std['profit'].min():,.2f} to ${within_2_std['profit'].max():,.2f}")
-                else:
-                    st.write("- No data")
-            
-            with col3:
-                st.write("**Game Statistics:**")
-                st.write(f"- Avg Hands Played: {results_df['hands_played'].mean():.1f}")
-                st.write(f"- Avg Max Loss Streak: {results_df['max_loss_streak'].mean():.1f}")
-                st.write(f"- Max Loss Streak (all): {results_df['max_loss_streak'].max()}")
-                st.write(f"- Busts: {bust_count} / {num_iterations}")
-                st.write(f"- Outliers (>2σ): {num_iterations - len(within_2_std)}")
-            
-            # Add visual representation of data distribution
-            st.markdown("### Profit Distribution Analysis")
-            st.write(f"""
-            **Understanding the data:**
-            - **Mean**: ${profit_mean:,.2f} - Average across all simulations
-            - **Median**: ${profit_median:,.2f} - Middle value (50th percentile)
-            - **1σ range**: ${profit_mean - profit_std:,.2f} to ${profit_mean + profit_std:,.2f} (contains ~68% of typical results)
-            - **2σ range**: ${profit_mean - 2*profit_std:,.2f} to ${profit_mean + 2*profit_std:,.2f} (contains ~95% of typical results)
-            
-            💡 **Typical profit** (excluding extreme outliers beyond 2σ): **${within_2_std['profit'].mean():,.2f}** based on {len(within_2_std)} simulations
-            """)
+            results_arr, traj_mat = run_monte_carlo(
+                bankroll_start, base_bet, bet_multiplier, num_decks, num_players, num_hands,
+                dealer_hits_soft_17, num_iterations, random_seed, _num_workers=num_workers,
+            )
+        render_results(results_arr, traj_mat)
 
 else:
     st.info("Set your parameters and click **Run Simulation** to begin.")
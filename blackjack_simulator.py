@@ -1,7 +1,20 @@
-import random
-from collections import namedtuple
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 
-Card = namedtuple("Card", ["rank", "suit"])
+import numpy as np
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # numba is optional; the kernels below then run as plain Python
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
 
 RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
 SUITS = ['♠', '♥', '♦', '♣']
@@ -10,96 +23,467 @@ VALUES = {
     '10': 10, 'J': 10, 'Q': 10, 'K': 10, 'A': 11
 }
 
+# One 52-card deck; shoes store int8 indexes into it so the JIT kernels can read them.
+# Cards are plain (rank, suit) tuples; simulation only ever sees their values (2..11, aces as 11)
+# and looks the tuples up for display.
+DECK = tuple((rank, suit) for rank in RANKS for suit in SUITS)
+CARD_VALUES = tuple(VALUES[rank] for rank, _ in DECK)
+DECK_VALUES = np.array(CARD_VALUES, dtype=np.int8)
+RESHUFFLE_AT = 15  # reshuffle when fewer cards than this remain
+
+
+@lru_cache(maxsize=None)
+def deck_template(num_decks):
+    """Unshuffled card array for a num_decks shoe; one shared read-only instance per deck count."""
+    template = np.tile(np.arange(len(DECK), dtype=np.int8), num_decks)
+    template.setflags(write=False)
+    return template
+
 
 class Shoe:
-    """Represents one or more decks shuffled together."""
-    def __init__(self, num_decks=6):
+    """
+    Represents one or more decks shuffled together.
+    Cards are a one-byte-per-card bytearray of indexes into DECK, consumed through an integer
+    cursor; self.cards is a zero-copy int8 NumPy view of the same bytes for shuffling and the
+    JIT kernels. draw() hands out plain int values and last_card() recovers the (rank, suit)
+    card for display.
+    Each shoe owns its own np.random.Generator, so independent shoes never share RNG state.
+    """
+    def __init__(self, num_decks=6, seed=None):
         self.num_decks = num_decks
-        self.cards = []
+        self._template = deck_template(num_decks)
+        self._bytes = bytearray(len(self._template))  # filled from the template by reset()
+        self.cards = np.frombuffer(self._bytes, dtype=np.int8)
+        self.cutoff = len(self.cards) - RESHUFFLE_AT  # last cursor that may be drawn without reshuffling
+        self.reset(seed)
+
+    def reset(self, seed=None):
+        """Restores the unshuffled shoe and reshuffles it with a fresh RNG seeded from seed."""
+        self.rng = np.random.default_rng(seed)
+        self._shuffle = self.rng.shuffle  # bound once; PCG64 in-place shuffle
+        self.cards[:] = self._template
         self.shuffle()
 
     def shuffle(self):
-        self.cards = [Card(rank, suit) for rank in RANKS for suit in SUITS] * self.num_decks
-        random.shuffle(self.cards)
+        # One in-place C-level shuffle per shoe; draws then just advance the cursor (no RNG per card)
+        self._shuffle(self.cards)
+        self.cursor = 0
 
     def draw(self):
-        if len(self.cards) < 15:
+        """Draws the next card and returns its blackjack value as an int."""
+        i = self.cursor
+        if i > self.cutoff:
             self.shuffle()
-        return self.cards.pop()
+            i = 0
+        self.cursor = i + 1
+        return CARD_VALUES[self._bytes[i]]
+
+    def skip(self, n):
+        """Burns n cards, reshuffling exactly where n calls to draw() would."""
+        while n > 0:
+            if self.cursor > self.cutoff:
+                self.shuffle()
+            step = min(n, self.cutoff + 1 - self.cursor)
+            self.cursor += step
+            n -= step
+
+    def last_card(self):
+        """The (rank, suit) card behind the most recent draw, for display."""
+        return DECK[self._bytes[self.cursor - 1]]
+
 
+def hand_str(cards):
+    return " ".join(rank + suit for rank, suit in cards)
 
-def hand_value(hand):
-    """Return best blackjack value treating Aces as 1 or 11."""
-    value = sum(VALUES[c.rank] for c in hand)
-    aces = sum(1 for c in hand if c.rank == 'A')
-    while value > 21 and aces:
-        value -= 10
-        aces -= 1
-    return value
 
+def _add_card(total, aces, v):
+    """Adds card value v to a running (total, aces still counted as 11) pair."""
+    total += v
+    aces += v == 11
+    # Demote just enough aces from 11 to 1 to get back to 21 or under, without a loop
+    demote = min(aces, max(0, (total - 12) // 10))
+    return total - 10 * demote, aces - demote
 
-def hand_str(hand):
-    return " ".join(f"{c.rank}{c.suit}" for c in hand)
+
+# The Python engine steps hands through a memoised _add_card: only a few hundred
+# (total, soft aces, card) combinations are reachable.
+_add_card_cached = lru_cache(maxsize=None)(_add_card)
+
+# Starting (total, soft aces) of every two-card hand, indexed by the two card values;
+# a starting total of 21 is a blackjack. Rows/columns 0 and 1 are unused padding.
+TWO_CARD = tuple(
+    tuple(_add_card(*_add_card(0, 0, a), b) if min(a, b) >= 2 else (0, 0) for b in range(12))
+    for a in range(12)
+)
+TWO_CARD_TOTALS = np.array([[total for total, _ in row] for row in TWO_CARD], dtype=np.int64)
+TWO_CARD_ACES = np.array([[aces for _, aces in row] for row in TWO_CARD], dtype=np.int64)
+
+
+# Infinite-deck chance of each card value; ten-valued cards are 4 of the 13 ranks
+CARD_PROBS = {v: (4 if v == 10 else 1) / 13 for v in range(2, 12)}
+DEALER_OUTCOMES = np.array([17, 18, 19, 20, 21, 22])  # final dealer totals, 22 standing for any bust
+
+
+@lru_cache(maxsize=None)
+def _dealer_finish(total, aces, dealer_hits_soft_17):
+    """Probabilities of each DEALER_OUTCOMES entry for a dealer currently holding (total, soft aces)."""
+    if total > 21:
+        return (0.0,) * 5 + (1.0,)
+    if total >= 17 and not (dealer_hits_soft_17 and total == 17 and aces):
+        return tuple(float(total == outcome) for outcome in DEALER_OUTCOMES)
+    probs = [0.0] * len(DEALER_OUTCOMES)
+    for v, p in CARD_PROBS.items():
+        for i, q in enumerate(_dealer_finish(*_add_card(total, aces, v), dealer_hits_soft_17)):
+            probs[i] += p * q
+    return tuple(probs)
+
+
+@lru_cache(maxsize=None)
+def dealer_outcome_table(dealer_hits_soft_17=False, no_blackjack=False):
+    """
+    Infinite-deck distribution of the dealer's final total by upcard: row v (2..11) gives the
+    probabilities of DEALER_OUTCOMES, naturals included unless no_blackjack conditions them
+    away (the dealer already checked the hole card). Read-only; rows 0 and 1 are zero.
+    """
+    table = np.zeros((12, len(DEALER_OUTCOMES)))
+    for up in CARD_PROBS:
+        for hole, p in CARD_PROBS.items():
+            total, aces = TWO_CARD[up][hole]
+            if not (no_blackjack and total == 21):
+                table[up] += p * np.array(_dealer_finish(total, aces, dealer_hits_soft_17))
+        table[up] /= table[up].sum()
+    table.setflags(write=False)
+    return table
 
 
-def is_blackjack(hand):
-    return len(hand) == 2 and hand_value(hand) == 21
+def sample_dealer_totals(upcards, rng, dealer_hits_soft_17=False, no_blackjack=False):
+    """Draws a final dealer total (22 = bust) for each upcard value from dealer_outcome_table."""
+    cdf = np.cumsum(dealer_outcome_table(dealer_hits_soft_17, no_blackjack)[upcards], axis=1)
+    picks = (rng.random((len(upcards), 1)) > cdf[:, :-1]).sum(axis=1)
+    return DEALER_OUTCOMES[picks]
 
 
-def is_soft_17(hand):
-    """True if hand is a soft 17 (Ace counted as 11)."""
-    total = sum(VALUES[c.rank] for c in hand)
-    aces = sum(1 for c in hand if c.rank == 'A')
-    return aces > 0 and total == 17
+def _deal(shoe, hand, cards):
+    """Draws one card: its value goes to hand and, unless cards is None, its (rank, suit) card to cards."""
+    hand.append(shoe.draw())
+    if cards is not None:
+        cards.append(shoe.last_card())
 
 
-def simulate_blackjack_hand(shoe, num_players=1, bet=10, dealer_hits_soft_17=False):
+def simulate_blackjack_hand(shoe, num_players=1, bet=10, dealer_hits_soft_17=False, return_details=False):
     """
     Simulates a single blackjack hand.
-    Returns (result, payout, dict with player/dealer hands and values)
+    Returns (result, payout, details): details is a dict with the player/dealer hands and values
+    when return_details is set, otherwise None and no display strings are built.
     """
-    dealer = [shoe.draw(), shoe.draw()]
-    player = [shoe.draw(), shoe.draw()]
-    other_players = [[shoe.draw(), shoe.draw()] for _ in range(num_players - 1)]
+    dealer, player = [], []
+    # (rank, suit) cards for display, collected only when details are wanted
+    dealer_cards = [] if return_details else None
+    player_cards = [] if return_details else None
+    _deal(shoe, dealer, dealer_cards)
+    _deal(shoe, dealer, dealer_cards)
+    _deal(shoe, player, player_cards)
+    _deal(shoe, player, player_cards)
+    shoe.skip(2 * (num_players - 1))  # other players' cards only deplete the shoe
 
-    player_bj = is_blackjack(player)
-    dealer_bj = is_blackjack(dealer)
+    p_val, p_aces = TWO_CARD[player[0]][player[1]]
+    d_val, d_aces = TWO_CARD[dealer[0]][dealer[1]]
+    player_bj = p_val == 21
+    dealer_bj = d_val == 21
 
     if player_bj and not dealer_bj:
-        return "win", 1.5 * bet, _hand_data(player, dealer)
+        return "win", 1.5 * bet, _hand_data(player_cards, dealer_cards, p_val, d_val)
     elif dealer_bj and not player_bj:
-        return "lose", 0, _hand_data(player, dealer)
+        return "lose", 0, _hand_data(player_cards, dealer_cards, p_val, d_val)
     elif player_bj and dealer_bj:
-        return "push", 0, _hand_data(player, dealer)
+        return "push", 0, _hand_data(player_cards, dealer_cards, p_val, d_val)
 
     # Player: hit until 17 or more
-    while hand_value(player) < 17:
-        player.append(shoe.draw())
-    if hand_value(player) > 21:
-        return "lose", 0, _hand_data(player, dealer)
-
-    # Dealer: hit until ≥17, optional hit soft 17
-    while True:
-        val = hand_value(dealer)
-        if val < 17 or (dealer_hits_soft_17 and is_soft_17(dealer)):
-            dealer.append(shoe.draw())
-        else:
-            break
-
-    p_val, d_val = hand_value(player), hand_value(dealer)
+    while p_val < 17:
+        _deal(shoe, player, player_cards)
+        p_val, p_aces = _add_card_cached(p_val, p_aces, player[-1])
+    if p_val > 21:
+        return "lose", 0, _hand_data(player_cards, dealer_cards, p_val, d_val)
+
+    # Dealer: hit until ≥17, optional hit soft 17 (rule checked once, not per hit).
+    # The running state already knows whether an ace is still counted as 11.
+    if dealer_hits_soft_17:
+        while d_val < 17 or (d_val == 17 and d_aces):
+            _deal(shoe, dealer, dealer_cards)
+            d_val, d_aces = _add_card_cached(d_val, d_aces, dealer[-1])
+    else:
+        while d_val < 17:
+            _deal(shoe, dealer, dealer_cards)
+            d_val, d_aces = _add_card_cached(d_val, d_aces, dealer[-1])
+
     if d_val > 21:
-        return "win", bet, _hand_data(player, dealer)
+        return "win", bet, _hand_data(player_cards, dealer_cards, p_val, d_val)
     if p_val > d_val:
-        return "win", bet, _hand_data(player, dealer)
+        return "win", bet, _hand_data(player_cards, dealer_cards, p_val, d_val)
     if p_val < d_val:
-        return "lose", 0, _hand_data(player, dealer)
-    return "push", 0, _hand_data(player, dealer)
+        return "lose", 0, _hand_data(player_cards, dealer_cards, p_val, d_val)
+    return "push", 0, _hand_data(player_cards, dealer_cards, p_val, d_val)
 
 
-def _hand_data(player, dealer):
+def _hand_data(player_cards, dealer_cards, p_val, d_val):
+    if player_cards is None:  # played without return_details
+        return None
     return {
-        "player": hand_str(player),
-        "dealer": hand_str(dealer),
-        "player_value": hand_value(player),
-        "dealer_value": hand_value(dealer),
+        "player": hand_str(player_cards),
+        "dealer": hand_str(dealer_cards),
+        "player_value": p_val,
+        "dealer_value": d_val,
     }
+
+
+WIN_CODE, PUSH_CODE, LOSE_CODE, BUST_CODE = 0, 1, 2, 3
+RESULT_LABELS = np.array(["win", "push", "lose", "BUST"], dtype=object)
+RESULT_CODES = {label: code for code, label in enumerate(RESULT_LABELS)}
+
+
+@njit(cache=True)
+def _draw_nb(cards, cursor, rng):
+    if cards.shape[0] - cursor < RESHUFFLE_AT:
+        rng.shuffle(cards)
+        cursor = 0
+    return DECK_VALUES[cards[cursor]], cursor + 1
+
+
+_add_card_nb = njit(cache=True)(_add_card)
+
+
+@njit(cache=True)
+def simulate_blackjack_hand_njit(cards, cursor, rng, num_players, bet, dealer_hits_soft_17):
+    """
+    Compiled counterpart of simulate_blackjack_hand operating on a Shoe's card array and Generator.
+    Returns (result code, payout, new cursor).
+    """
+    d1, cursor = _draw_nb(cards, cursor, rng)
+    d2, cursor = _draw_nb(cards, cursor, rng)
+    p1, cursor = _draw_nb(cards, cursor, rng)
+    p2, cursor = _draw_nb(cards, cursor, rng)
+    for _ in range(2 * (num_players - 1)):
+        _, cursor = _draw_nb(cards, cursor, rng)
+
+    p_total, p_aces = TWO_CARD_TOTALS[p1, p2], TWO_CARD_ACES[p1, p2]
+    d_total, d_aces = TWO_CARD_TOTALS[d1, d2], TWO_CARD_ACES[d1, d2]
+
+    player_bj = p_total == 21
+    dealer_bj = d_total == 21
+    if player_bj and not dealer_bj:
+        return WIN_CODE, 1.5 * bet, cursor
+    elif dealer_bj and not player_bj:
+        return LOSE_CODE, 0.0, cursor
+    elif player_bj and dealer_bj:
+        return PUSH_CODE, 0.0, cursor
+
+    # Player: hit until 17 or more
+    while p_total < 17:
+        v, cursor = _draw_nb(cards, cursor, rng)
+        p_total, p_aces = _add_card_nb(p_total, p_aces, v)
+    if p_total > 21:
+        return LOSE_CODE, 0.0, cursor
+
+    # Dealer: hit until >=17, optional hit soft 17 (an ace still counted as 11)
+    while d_total < 17 or (dealer_hits_soft_17 and d_total == 17 and d_aces > 0):
+        v, cursor = _draw_nb(cards, cursor, rng)
+        d_total, d_aces = _add_card_nb(d_total, d_aces, v)
+
+    if d_total > 21 or p_total > d_total:
+        return WIN_CODE, bet, cursor
+    if p_total < d_total:
+        return LOSE_CODE, 0.0, cursor
+    return PUSH_CODE, 0.0, cursor
+
+
+class ShoeBatch:
+    """
+    Independent shoes stacked row-wise so many tables can be dealt in lockstep.
+    Row t starts as Shoe(num_decks, seed=seeds[t]) and reshuffles with that shoe's Generator.
+    """
+    def __init__(self, num_decks, seeds):
+        self.cards = np.tile(deck_template(num_decks), (len(seeds), 1))
+        self.cursors = np.zeros(len(seeds), np.int64)
+        self.rngs = [np.random.default_rng(seed) for seed in seeds]
+        for row, rng in zip(self.cards, self.rngs):
+            rng.shuffle(row)
+
+    def draw(self, tables):
+        """Draws one card value at each table in tables (an index array)."""
+        low = tables[self.cards.shape[1] - self.cursors[tables] < RESHUFFLE_AT]
+        for t in low:
+            self.rngs[t].shuffle(self.cards[t])
+        self.cursors[low] = 0
+        cursors = self.cursors[tables]
+        self.cursors[tables] = cursors + 1
+        return DECK_VALUES[self.cards[tables, cursors]]
+
+
+def _add_card_batch(total, aces, v):
+    """Vectorised _add_card_nb: adds card values v to running (total, soft aces) arrays."""
+    total = total + v
+    aces = aces + (v == 11)
+    demote = np.minimum(aces, np.maximum(0, (total - 12) // 10))
+    return total - 10 * demote, aces - demote
+
+
+def _dealer_must_hit(total, aces, dealer_hits_soft_17):
+    # Soft 17: a total of 17 with an ace still counted as 11
+    return (total < 17) | (dealer_hits_soft_17 & (total == 17) & (aces > 0))
+
+
+def simulate_blackjack_hand_batch(shoes, tables, bets, num_players=1, dealer_hits_soft_17=False,
+                                  dealer_rng=None):
+    """
+    Vectorised simulate_blackjack_hand: plays one hand at each table in tables from a ShoeBatch,
+    drawing cards in the same order as the scalar version. Given dealer_rng, the dealer's draws
+    after the blackjack check are replaced by one sample_dealer_totals draw per hand
+    (an infinite-deck approximation).
+    Returns (result codes, payouts) aligned with tables.
+    """
+    d1 = shoes.draw(tables)
+    d2 = shoes.draw(tables)
+    p1 = shoes.draw(tables)
+    p2 = shoes.draw(tables)
+    for _ in range(2 * (num_players - 1)):
+        shoes.draw(tables)
+
+    p_total, p_aces = TWO_CARD_TOTALS[p1, p2], TWO_CARD_ACES[p1, p2]
+    d_total, d_aces = TWO_CARD_TOTALS[d1, d2], TWO_CARD_ACES[d1, d2]
+
+    results = np.full(len(tables), PUSH_CODE, np.int8)
+    payouts = np.zeros(len(tables), np.float64)
+    player_bj = p_total == 21
+    dealer_bj = d_total == 21
+    bj_win = player_bj & ~dealer_bj
+    results[bj_win] = WIN_CODE
+    payouts[bj_win] = 1.5 * bets[bj_win]
+    results[dealer_bj & ~player_bj] = LOSE_CODE
+    in_play = ~(player_bj | dealer_bj)
+
+    # Player: hit until 17 or more
+    hit = np.flatnonzero(in_play & (p_total < 17))
+    while hit.size:
+        p_total[hit], p_aces[hit] = _add_card_batch(p_total[hit], p_aces[hit], shoes.draw(tables[hit]))
+        hit = hit[p_total[hit] < 17]
+    player_bust = in_play & (p_total > 21)
+    results[player_bust] = LOSE_CODE
+    in_play &= ~player_bust
+
+    # Dealer: hit until >=17, optional hit soft 17
+    hit = np.flatnonzero(in_play)
+    if dealer_rng is not None:
+        d_total[hit] = sample_dealer_totals(d1[hit], dealer_rng, dealer_hits_soft_17, no_blackjack=True)
+    else:
+        hit = hit[_dealer_must_hit(d_total[hit], d_aces[hit], dealer_hits_soft_17)]
+        while hit.size:
+            d_total[hit], d_aces[hit] = _add_card_batch(d_total[hit], d_aces[hit], shoes.draw(tables[hit]))
+            hit = hit[_dealer_must_hit(d_total[hit], d_aces[hit], dealer_hits_soft_17)]
+
+    win = in_play & ((d_total > 21) | (p_total > d_total))
+    results[win] = WIN_CODE
+    payouts[win] = bets[win]
+    results[in_play & ~win & (p_total < d_total)] = LOSE_CODE
+    return results, payouts
+
+
+@njit(cache=True)
+def _play_table_njit(cards, rng, num_players, bet, dealer_hits_soft_17, results, payouts):
+    """Plays len(results) hands in a row from one freshly shuffled shoe, filling results/payouts."""
+    cursor = 0
+    for r in range(results.shape[0]):
+        results[r], payouts[r], cursor = simulate_blackjack_hand_njit(
+            cards, cursor, rng, num_players, bet, dealer_hits_soft_17
+        )
+
+
+def simulate_many(n_hands, num_decks=6, num_players=1, bet=10, dealer_hits_soft_17=False, seed=None,
+                  num_tables=256, dealer_model="shoe"):
+    """
+    Plays n_hands independent flat-bet hands, dealing them round-robin from num_tables shoes
+    seeded from seed: table by table in compiled code when numba is available, otherwise in
+    lockstep with simulate_blackjack_hand_batch. Both give the same hands.
+    dealer_model="infinite" instead samples each dealer's final total from dealer_outcome_table
+    by upcard (lockstep only): faster, but an approximation of the real shoe.
+    Returns (result codes, payouts) with one entry per hand.
+    """
+    if dealer_model not in ("shoe", "infinite"):
+        raise ValueError(f"unknown dealer_model {dealer_model!r}")
+    num_tables = max(1, min(num_tables, n_hands))
+    # Child seeds don't depend on how many are spawned, so the shoes match across dealer models
+    seeds = np.random.SeedSequence(seed).spawn(num_tables + 1)
+    shoes = ShoeBatch(num_decks, seeds[:num_tables])
+    dealer_rng = np.random.default_rng(seeds[-1]) if dealer_model == "infinite" else None
+    tables = np.arange(num_tables)
+    bets = np.full(num_tables, float(bet))
+
+    rounds = -(-n_hands // num_tables)
+    results = np.empty((num_tables, rounds), np.int8)
+    payouts = np.empty((num_tables, rounds), np.float64)
+    if HAVE_NUMBA and dealer_rng is None:
+        for t in tables:
+            _play_table_njit(shoes.cards[t], shoes.rngs[t], num_players, float(bet), dealer_hits_soft_17,
+                             results[t], payouts[t])
+    else:
+        for r in range(rounds):
+            results[:, r], payouts[:, r] = simulate_blackjack_hand_batch(
+                shoes, tables, bets, num_players=num_players, dealer_hits_soft_17=dealer_hits_soft_17,
+                dealer_rng=dealer_rng,
+            )
+    return results.T.ravel()[:n_hands], payouts.T.ravel()[:n_hands]
+
+
+# worker count -> executor, kept alive across run_simulation calls. Pools are only closed by
+# shutdown_pools(), never swapped out, so a caller can't lose its executor mid-map.
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(workers):
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = _pools[workers] = ProcessPoolExecutor(max_workers=workers)
+        return pool
+
+
+def shutdown_pools():
+    """Shuts down the worker pools kept by run_simulation; later calls start new ones."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown()
+
+
+def _count_hands(task):
+    """Worker: plays one chunk with simulate_many and returns its (win, push, lose) counts and payouts."""
+    n_hands, seed, kwargs = task
+    results, payouts = simulate_many(n_hands, seed=seed, **kwargs)
+    return np.bincount(results, minlength=3)[:3], payouts.sum()
+
+
+def run_simulation(n_hands, workers=None, num_decks=6, num_players=1, bet=10, dealer_hits_soft_17=False,
+                   seed=None, dealer_model="shoe"):
+    """
+    Plays n_hands flat-bet hands split across worker processes (default: one per CPU), each
+    chunk on its own seeded shoes. Results are reproducible for a given seed and worker count.
+    Returns a dict of win/push/lose counts and the net result in chips.
+    """
+    workers = max(1, min(workers or os.cpu_count() or 1, n_hands))
+    sizes = [len(chunk) for chunk in np.array_split(np.arange(n_hands), workers)]
+    seeds = np.random.SeedSequence(seed).generate_state(workers)
+    kwargs = dict(num_decks=num_decks, num_players=num_players, bet=bet, dealer_hits_soft_17=dealer_hits_soft_17,
+                  dealer_model=dealer_model)
+    tasks = [(size, int(chunk_seed), kwargs) for size, chunk_seed in zip(sizes, seeds)]
+
+    if workers == 1:
+        chunks = map(_count_hands, tasks)
+    else:
+        chunks = _get_pool(workers).map(_count_hands, tasks)
+    counts, winnings = np.zeros(3, np.int64), 0.0
+    for chunk_counts, chunk_winnings in chunks:
+        counts += chunk_counts
+        winnings += chunk_winnings
+    win, push, lose = (int(c) for c in counts)
+    return {"win": win, "push": push, "lose": lose, "net": float(winnings - bet * lose)}
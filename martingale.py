@@ -0,0 +1,319 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from blackjack_simulator import (
+    BUST_CODE, HAVE_NUMBA, LOSE_CODE, RESULT_CODES, RESULT_LABELS, WIN_CODE,
+    Shoe, ShoeBatch, njit, simulate_blackjack_hand, simulate_blackjack_hand_batch, simulate_blackjack_hand_njit,
+)
+
+
+@njit(cache=True)
+def _simulate_martingale_float(cards, cursor, rng, bankroll_start, base_bet, bet_multiplier, num_players,
+                               num_hands, dealer_hits_soft_17, bankroll_out):
+    """
+    Martingale state machine writing the bankroll after each hand into bankroll_out.
+    Returns (hands played, new cursor, bust flag, max loss streak).
+    Only a loss can raise the bet or shrink the bankroll, so the bust and broke checks
+    live on that branch (plus one check before the first hand).
+    """
+    bankroll = bankroll_start
+    loss_streak = 0
+    max_streak = 0
+    current_bet = base_bet  # base_bet * bet_multiplier ** loss_streak, kept up to date incrementally
+    n = 0
+
+    # If the first required bet exceeds bankroll, bust
+    if num_hands > 0 and current_bet > bankroll:
+        bankroll_out[0] = bankroll
+        return 1, cursor, True, max_streak
+
+    while n < num_hands:
+        result, payout, cursor = simulate_blackjack_hand_njit(
+            cards, cursor, rng, num_players, current_bet, dealer_hits_soft_17
+        )
+        if result == WIN_CODE:
+            bankroll += payout
+            loss_streak = 0
+            current_bet = base_bet
+        elif result == LOSE_CODE:
+            bankroll -= current_bet
+            current_bet *= bet_multiplier
+            loss_streak += 1
+            if loss_streak > max_streak:
+                max_streak = loss_streak
+            if bankroll <= 0 or current_bet > bankroll:
+                bankroll_out[n] = bankroll
+                n += 1
+                # Unless broke, a next required bet above bankroll makes the next hand a bust
+                if bankroll > 0 and n < num_hands:
+                    bankroll_out[n] = bankroll
+                    return n + 1, cursor, True, max_streak
+                return n, cursor, False, max_streak
+        bankroll_out[n] = bankroll
+        n += 1
+
+    return n, cursor, False, max_streak
+
+
+@njit(cache=True)
+def _simulate_martingale_int_shift(cards, cursor, rng, bankroll_start, base_bet, num_players, num_hands,
+                                   dealer_hits_soft_17, bankroll_out):
+    """
+    _simulate_martingale_float specialised for a 2x multiplier on integer cents:
+    doubling is a left shift and nothing in the loop touches floats except the hand payout.
+    base_bet must be even so 3:2 blackjack payouts stay whole cents.
+    """
+    bankroll = bankroll_start
+    loss_streak = 0
+    max_streak = 0
+    current_bet = base_bet
+    n = 0
+
+    if num_hands > 0 and current_bet > bankroll:
+        bankroll_out[0] = bankroll
+        return 1, cursor, True, max_streak
+
+    while n < num_hands:
+        result, payout, cursor = simulate_blackjack_hand_njit(
+            cards, cursor, rng, num_players, current_bet, dealer_hits_soft_17
+        )
+        if result == WIN_CODE:
+            bankroll += int(payout)
+            loss_streak = 0
+            current_bet = base_bet
+        elif result == LOSE_CODE:
+            bankroll -= current_bet
+            current_bet <<= 1
+            loss_streak += 1
+            if loss_streak > max_streak:
+                max_streak = loss_streak
+            if bankroll <= 0 or current_bet > bankroll:
+                bankroll_out[n] = bankroll
+                n += 1
+                if bankroll > 0 and n < num_hands:
+                    bankroll_out[n] = bankroll
+                    return n + 1, cursor, True, max_streak
+                return n, cursor, False, max_streak
+        bankroll_out[n] = bankroll
+        n += 1
+
+    return n, cursor, False, max_streak
+
+
+def _to_cents(amount):
+    """Returns amount in whole cents, or None if it isn't a whole number of cents."""
+    cents = round(amount * 100)
+    return cents if cents == amount * 100 else None
+
+
+def simulate_martingale(bankroll_start, base_bet, bet_multiplier, shoe, num_players, num_hands,
+                        dealer_hits_soft_17, record_detail=True):
+    """
+    Plays up to num_hands with strict Martingale betting.
+    Returns (summary, data) where summary is (bust, final_bankroll, hands_played, max_loss_streak)
+    and data is a DataFrame of the full hand history. With record_detail=False the compiled
+    kernel skips all hand/string bookkeeping and data is just the bankroll trajectory array.
+    """
+    if not record_detail:
+        start_cents, bet_cents = _to_cents(bankroll_start), _to_cents(base_bet)
+        if bet_multiplier == 2.0 and start_cents is not None and bet_cents is not None and bet_cents % 2 == 0:
+            cents_arr = np.empty(num_hands, np.int64)
+            n, shoe.cursor, bust, max_streak = _simulate_martingale_int_shift(
+                shoe.cards, shoe.cursor, shoe.rng, start_cents, bet_cents,
+                num_players, num_hands, dealer_hits_soft_17, cents_arr,
+            )
+            bankroll_arr = cents_arr[:n] / 100
+        else:
+            bankroll_arr = np.empty(num_hands, np.float64)
+            n, shoe.cursor, bust, max_streak = _simulate_martingale_float(
+                shoe.cards, shoe.cursor, shoe.rng, float(bankroll_start), float(base_bet), float(bet_multiplier),
+                num_players, num_hands, dealer_hits_soft_17, bankroll_arr,
+            )
+            bankroll_arr = bankroll_arr[:n]
+        return (bust, bankroll_arr[-1], n, max_streak), bankroll_arr
+
+    bankroll_arr = np.empty(num_hands, np.float64)
+    bet_arr = np.empty(num_hands, np.float64)
+    streak_arr = np.empty(num_hands, np.int64)
+    result_arr = np.empty(num_hands, np.uint8)
+    player_hands, dealer_hands, player_values, dealer_values = [], [], [], []
+    bankroll = bankroll_start
+    loss_streak = 0
+    max_streak = 0
+    bust = False
+    current_bet = base_bet  # base_bet * bet_multiplier ** loss_streak, kept up to date incrementally
+    n = 0
+
+    for n in range(1, num_hands + 1):
+        idx = n - 1
+        bet_arr[idx] = current_bet
+
+        # If next required bet exceeds bankroll, bust
+        if current_bet > bankroll:
+            bust = True
+            result_arr[idx] = BUST_CODE
+            bankroll_arr[idx] = bankroll
+            streak_arr[idx] = loss_streak
+            player_hands.append("")
+            dealer_hands.append("")
+            player_values.append("")
+            dealer_values.append("")
+            break
+
+        result, payout, hands = simulate_blackjack_hand(
+            shoe, num_players=num_players, bet=current_bet, dealer_hits_soft_17=dealer_hits_soft_17,
+            return_details=True,
+        )
+
+        if result == "win":
+            bankroll += payout
+            loss_streak = 0
+            current_bet = base_bet
+        elif result == "push":
+            pass
+        else:  # lose
+            bankroll -= current_bet
+            current_bet *= bet_multiplier
+            loss_streak += 1
+            max_streak = max(max_streak, loss_streak)
+
+        result_arr[idx] = RESULT_CODES[result]
+        bankroll_arr[idx] = bankroll
+        streak_arr[idx] = loss_streak
+        player_hands.append(hands["player"])
+        dealer_hands.append(hands["dealer"])
+        player_values.append(hands["player_value"])
+        dealer_values.append(hands["dealer_value"])
+
+        if bankroll <= 0:
+            break
+
+    bankroll_arr = bankroll_arr[:n]
+    df = pd.DataFrame({
+        "hand": np.arange(1, n + 1),
+        "result": RESULT_LABELS[result_arr[:n]],
+        "player_hand": player_hands,
+        "dealer_hand": dealer_hands,
+        "player_value": player_values,
+        "dealer_value": dealer_values,
+        "bet": bet_arr[:n],
+        "bankroll": bankroll_arr,
+        "profit": bankroll_arr - bankroll_start,
+        "streak_losses": streak_arr[:n],
+    })
+    return (bust, bankroll, n, max_streak), df
+
+
+def simulate_martingale_batch(bankroll_start, base_bet, bet_multiplier, num_decks, num_players, num_hands,
+                              dealer_hits_soft_17, seeds):
+    """
+    Vectorised Monte Carlo: plays one table per seed, all advancing a hand at a time in lockstep.
+    Table t plays exactly the hands simulate_martingale(record_detail=False) would on
+    Shoe(num_decks, seed=seeds[t]). Returns ((bust, final_bankroll, hands_played, max_loss_streak)
+    arrays, bankroll trajectory matrix of shape (num_hands, len(seeds)), NaN after a table stops).
+    """
+    shoes = ShoeBatch(num_decks, seeds)
+    num_tables = len(seeds)
+    bankroll = np.full(num_tables, bankroll_start, np.float64)
+    current_bet = np.full(num_tables, base_bet, np.float64)
+    loss_streak = np.zeros(num_tables, np.int64)
+    max_streak = np.zeros(num_tables, np.int64)
+    hands_played = np.zeros(num_tables, np.int64)
+    bust = np.zeros(num_tables, bool)
+    alive = np.ones(num_tables, bool)
+    traj_mat = np.full((num_hands, num_tables), np.nan)
+
+    for hand in range(num_hands):
+        # If next required bet exceeds bankroll, bust
+        busting = alive & (current_bet > bankroll)
+        bust |= busting
+        traj_mat[hand, busting] = bankroll[busting]
+        hands_played[busting] = hand + 1
+        alive &= ~busting
+
+        tables = np.flatnonzero(alive)
+        if not tables.size:
+            break
+        results, payouts = simulate_blackjack_hand_batch(
+            shoes, tables, current_bet[tables], num_players, dealer_hits_soft_17
+        )
+
+        won = results == WIN_CODE
+        bankroll[tables[won]] += payouts[won]
+        loss_streak[tables[won]] = 0
+        current_bet[tables[won]] = base_bet
+        lost = tables[results == LOSE_CODE]
+        bankroll[lost] -= current_bet[lost]
+        current_bet[lost] *= bet_multiplier
+        loss_streak[lost] += 1
+        np.maximum(max_streak, loss_streak, out=max_streak)
+
+        traj_mat[hand, tables] = bankroll[tables]
+        hands_played[tables] = hand + 1
+        alive[tables[bankroll[tables] <= 0]] = False
+
+    return (bust, bankroll, hands_played, max_streak), traj_mat
+
+
+# One row per Monte Carlo iteration; _run_one returns every field after "iteration" as a tuple
+RESULTS_DTYPE = np.dtype([
+    ("iteration", "i4"), ("bust", "?"), ("final_bankroll", "f8"), ("profit", "f8"),
+    ("hands_played", "i4"), ("max_loss_streak", "i4"), ("won", "?"),
+])
+
+# num_decks -> Shoe, built once per thread. In a pool worker that means once per process;
+# run in-process, each Streamlit session thread gets its own so reset() calls can't interleave.
+_worker_shoes = threading.local()
+
+
+def _run_one(task):
+    """
+    Runs one Monte Carlo iteration; module-level so worker processes can pickle it.
+    Returns (RESULTS_DTYPE record tuple without the iteration number, bankroll trajectory
+    array) instead of a DataFrame or dict to keep the payload sent back to the parent small.
+    """
+    (seed, bankroll_start, base_bet, bet_multiplier, num_decks,
+     num_players, num_hands, dealer_hits_soft_17) = task
+
+    # Reuse this thread's shoe for the deck size; reset() reseeds and reshuffles it
+    shoes = getattr(_worker_shoes, "by_decks", None)
+    if shoes is None:
+        shoes = _worker_shoes.by_decks = {}
+    shoe = shoes.get(num_decks)
+    if shoe is None:
+        shoe = shoes[num_decks] = Shoe(num_decks=num_decks, seed=seed)
+    else:
+        shoe.reset(seed)
+
+    (bust, final_bankroll, hands_played, max_streak), bankrolls = simulate_martingale(
+        bankroll_start, base_bet, bet_multiplier, shoe, num_players, num_hands, dealer_hits_soft_17,
+        record_detail=False,
+    )
+
+    total_profit = final_bankroll - bankroll_start
+    record = (bust, final_bankroll, total_profit, hands_played, max_streak, not bust and total_profit >= 0)
+    return record, bankrolls
+
+
+def _run_batch(tasks):
+    """
+    Runs several _run_one tasks (same parameters, different seeds) in one call to amortise
+    submit/pickle overhead. Without numba the batch is played by simulate_martingale_batch,
+    which gives the same results as running each task through _run_one.
+    """
+    if HAVE_NUMBA or len(tasks) == 1:
+        return [_run_one(task) for task in tasks]
+
+    bankroll_start = tasks[0][1]
+    (bust, final_bankroll, hands_played, max_streak), traj_mat = simulate_martingale_batch(
+        *tasks[0][1:], seeds=[task[0] for task in tasks]
+    )
+    profit = final_bankroll - bankroll_start
+    won = ~bust & (profit >= 0)
+    return [
+        ((bust[t], final_bankroll[t], profit[t], hands_played[t], max_streak[t], won[t]),
+         traj_mat[:hands_played[t], t])
+        for t in range(len(tasks))
+    ]